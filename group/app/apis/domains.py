@@ -1,10 +1,10 @@
 """Google Workspace Domains API operations"""
-from googleapiclient.errors import HttpError
-from fastmcp.exceptions import ToolError
-from .helper import logger
+from .helper import cached_read, handle_google_errors, quote
 
 
-def list_domains(service, customer: str = "my_customer"):
+@cached_read
+@handle_google_errors("list domains")
+async def list_domains(service, customer: str = "my_customer"):
     """List all domains in the Google Workspace account.
     
     Args:
@@ -14,21 +14,20 @@ def list_domains(service, customer: str = "my_customer"):
     Returns:
         Dictionary with domains list
     """
-    try:
-        result = service.domains().list(customer=customer).execute()
-        
-        return {
-            "domains": result.get("domains", [])
-        }
-    except HttpError as err:
-        logger.error(f"Failed to list domains. HttpError: {err}")
-        raise ToolError(f"Failed to list domains. HttpError: {err}")
-    except Exception as e:
-        logger.error(f"Failed to list domains. Exception: {e}")
-        raise ToolError(f"Failed to list domains. Exception: {e}")
+    result = await service.request(
+        "GET",
+        f"/customer/{quote(customer)}/domains",
+        params={"fields": "domains(domainName,isPrimary,verified,creationTime)"},
+    )
+    
+    return {
+        "domains": result.get("domains", [])
+    }
 
 
-def get_domain(service, domain_name: str, customer: str = "my_customer"):
+@cached_read
+@handle_google_errors("get domain")
+async def get_domain(service, domain_name: str, customer: str = "my_customer"):
     """Get details of a specific domain.
     
     Args:
@@ -39,16 +38,10 @@ def get_domain(service, domain_name: str, customer: str = "my_customer"):
     Returns:
         Dictionary with domain details
     """
-    try:
-        result = service.domains().get(
-            customer=customer,
-            domainName=domain_name
-        ).execute()
-        
-        return result
-    except HttpError as err:
-        logger.error(f"Failed to get domain. HttpError: {err}")
-        raise ToolError(f"Failed to get domain. HttpError: {err}")
-    except Exception as e:
-        logger.error(f"Failed to get domain. Exception: {e}")
-        raise ToolError(f"Failed to get domain. Exception: {e}")
+    result = await service.request(
+        "GET",
+        f"/customer/{quote(customer)}/domains/{quote(domain_name)}",
+        params={"fields": "domainName,isPrimary,verified,creationTime"},
+    )
+    
+    return result
@@ -1,10 +1,12 @@
 """Google Groups API operations"""
-from googleapiclient.errors import HttpError
-from fastmcp.exceptions import ToolError
-from .helper import logger
+from .helper import MAX_PAGE_SIZE, cached_read, invalidate_cached_reads, handle_google_errors, quote
 
+# Partial response mask for groups list pages
+GROUP_LIST_FIELDS = "groups(id,email,name,description,directMembersCount),nextPageToken"
 
-def list_groups(service, max_results: int = 50, customer: str = "my_customer", domain: str | None = None, page_token: str | None = None):
+
+@handle_google_errors("list groups")
+async def list_groups(service, max_results: int = 50, customer: str = "my_customer", domain: str | None = None, page_token: str | None = None):
     """List all groups in the domain.
     
     Args:
@@ -17,33 +19,55 @@ def list_groups(service, max_results: int = 50, customer: str = "my_customer", d
     Returns:
         Dictionary with groups list and nextPageToken if available
     """
-    try:
-        params = {
-            "customer": customer,
-            "maxResults": max_results,
-        }
+    params = {
+        "customer": customer,
+        "maxResults": max_results,
+        "fields": GROUP_LIST_FIELDS,
+    }
+    
+    if domain:
+        params["domain"] = domain
         
-        if domain:
-            params["domain"] = domain
-            
-        if page_token:
-            params["pageToken"] = page_token
-            
-        result = service.groups().list(**params).execute()
+    if page_token:
+        params["pageToken"] = page_token
         
-        return {
-            "groups": result.get("groups", []),
-            "nextPageToken": result.get("nextPageToken")
-        }
-    except HttpError as err:
-        logger.error(f"Failed to list groups. HttpError: {err}")
-        raise ToolError(f"Failed to list groups. HttpError: {err}")
-    except Exception as e:
-        logger.error(f"Failed to list groups. Exception: {e}")
-        raise ToolError(f"Failed to list groups. Exception: {e}")
-
-
-def get_group(service, group_email: str):
+    result = await service.request("GET", "/groups", params=params)
+    
+    return {
+        "groups": result.get("groups", []),
+        "nextPageToken": result.get("nextPageToken")
+    }
+
+
+async def stream_groups(service, customer: str = "my_customer", domain: str | None = None):
+    """Yield every group in the domain one page at a time.
+
+    Pages are requested lazily, once the caller has consumed the previous one. The `fetch_all`
+    tools still collect every page into one result, so paging lazily enables progress reporting
+    between pages but does not bound the memory of that result.
+
+    Args:
+        service: Google Directory API service client
+        customer: Customer ID (use 'my_customer' for current account)
+        domain: Optional domain to filter groups by
+
+    Yields:
+        List of groups in each page
+    """
+    page_token = None
+    while True:
+        result = await list_groups(
+            service, max_results=MAX_PAGE_SIZE, customer=customer, domain=domain, page_token=page_token
+        )
+        yield result["groups"]
+        page_token = result["nextPageToken"]
+        if not page_token:
+            return
+
+
+@cached_read
+@handle_google_errors("get group {group_email}")
+async def get_group(service, group_email: str):
     """Get details of a specific group.
     
     Args:
@@ -53,18 +77,16 @@ def get_group(service, group_email: str):
     Returns:
         Dictionary with group details
     """
-    try:
-        group = service.groups().get(groupKey=group_email).execute()
-        return group
-    except HttpError as err:
-        logger.error(f"Failed to get group {group_email}. HttpError: {err}")
-        raise ToolError(f"Failed to get group {group_email}. HttpError: {err}")
-    except Exception as e:
-        logger.error(f"Failed to get group {group_email}. Exception: {e}")
-        raise ToolError(f"Failed to get group {group_email}. Exception: {e}")
-
-
-def create_group(service, email: str, name: str, description: str = ""):
+    group = await service.request(
+        "GET",
+        f"/groups/{quote(group_email)}",
+        params={"fields": "id,email,name,description,directMembersCount,adminCreated,aliases"},
+    )
+    return group
+
+
+@handle_google_errors("create group")
+async def create_group(service, email: str, name: str, description: str = ""):
     """Create a new group.
     
     Args:
@@ -76,24 +98,18 @@ def create_group(service, email: str, name: str, description: str = ""):
     Returns:
         Dictionary with created group details
     """
-    try:
-        group_body = {
-            "email": email,
-            "name": name,
-            "description": description
-        }
-        
-        group = service.groups().insert(body=group_body).execute()
-        return group
-    except HttpError as err:
-        logger.error(f"Failed to create group. HttpError: {err}")
-        raise ToolError(f"Failed to create group. HttpError: {err}")
-    except Exception as e:
-        logger.error(f"Failed to create group. Exception: {e}")
-        raise ToolError(f"Failed to create group. Exception: {e}")
+    group_body = {
+        "email": email,
+        "name": name,
+        "description": description
+    }
+    
+    group = await service.request("POST", "/groups", body=group_body)
+    return group
 
 
-def update_group(service, group_email: str, name: str | None = None, description: str | None = None):
+@handle_google_errors("update group {group_email}")
+async def update_group(service, group_email: str, name: str | None = None, description: str | None = None):
     """Update an existing group.
     
     Args:
@@ -105,27 +121,23 @@ def update_group(service, group_email: str, name: str | None = None, description
     Returns:
         Dictionary with updated group details
     """
-    try:
-        # First get the current group
-        group = service.groups().get(groupKey=group_email).execute()
+    # Patch only the fields that are provided
+    group_body = {}
+    if name:
+        group_body["name"] = name
+    if description is not None:  # Allow empty string
+        group_body["description"] = description
+
+    if not group_body:
+        return await get_group(service, group_email)
         
-        # Update only the fields that are provided
-        if name:
-            group["name"] = name
-        if description is not None:  # Allow empty string
-            group["description"] = description
-            
-        updated_group = service.groups().update(groupKey=group_email, body=group).execute()
-        return updated_group
-    except HttpError as err:
-        logger.error(f"Failed to update group {group_email}. HttpError: {err}")
-        raise ToolError(f"Failed to update group {group_email}. HttpError: {err}")
-    except Exception as e:
-        logger.error(f"Failed to update group {group_email}. Exception: {e}")
-        raise ToolError(f"Failed to update group {group_email}. Exception: {e}")
-
-
-def delete_group(service, group_email: str):
+    updated_group = await service.request("PATCH", f"/groups/{quote(group_email)}", body=group_body)
+    invalidate_cached_reads("get_group", group_email)
+    return updated_group
+
+
+@handle_google_errors("delete group {group_email}")
+async def delete_group(service, group_email: str):
     """Delete a group.
     
     Args:
@@ -135,13 +147,8 @@ def delete_group(service, group_email: str):
     Returns:
         Success message
     """
-    try:
-        service.groups().delete(groupKey=group_email).execute()
-        return f"Group {group_email} deleted successfully."
-    except HttpError as err:
-        logger.error(f"Failed to delete group {group_email}. HttpError: {err}")
-        raise ToolError(f"Failed to delete group {group_email}. HttpError: {err}")
-    except Exception as e:
-        logger.error(f"Failed to delete group {group_email}. Exception: {e}")
-        raise ToolError(f"Failed to delete group {group_email}. Exception: {e}")
+    await service.request("DELETE", f"/groups/{quote(group_email)}")
+    invalidate_cached_reads("get_group", group_email)
+    invalidate_cached_reads("has_member", group_email)
+    return f"Group {group_email} deleted successfully."
 
@@ -1,8 +1,20 @@
 import sys
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import asyncio
+import email.parser
+import email.utils
+import functools
+import hashlib
+import inspect
+import itertools
+import random
+import threading
+import urllib.parse
+import uuid
+from datetime import datetime, timezone
 import logging
+import httpx
+import orjson
+from cachetools import TTLCache
 from fastmcp.exceptions import ToolError
 
 
@@ -17,7 +29,11 @@ def setup_logger(name, tool_name: str = "Google Groups MCP server"):
     """
     # Create a logger
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)  # Set the logging level
+    if logger.handlers:
+        # Already configured, e.g. on module reload; don't stack another handler
+        return logger
+    logger.setLevel(logging.INFO)  # Set the logging level
+    logger.propagate = False  # Avoid emitting records a second time through the root logger
 
     # Create a stream handler that writes to sys.stderr
     stderr_handler = logging.StreamHandler(sys.stderr)
@@ -37,20 +53,334 @@ def setup_logger(name, tool_name: str = "Google Groups MCP server"):
 logger = setup_logger(__name__)
 
 
-def get_client(cred_token: str):
-    """Build Google Directory API client for Groups management.
-    
+class HttpError(Exception):
+    """Error response returned by the Directory API."""
+
+    def __init__(self, status: int, reason: str, uri: str):
+        self.status = status
+        self.reason = reason
+        self.uri = uri
+        super().__init__(f'<HttpError {status} when requesting {uri} returned "{reason}">')
+
+
+def handle_google_errors(action: str):
+    """Log errors raised by the decorated coroutine and re-raise them as ToolError.
+
     Args:
-        cred_token: OAuth access token
-        
+        action: What the function does, formatted with its arguments, e.g. "get group {group_email}"
+
     Returns:
-        Google Directory API service client
+        Decorator for async functions
     """
-    creds = Credentials(token=cred_token)
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        def to_tool_error(err: Exception, args, kwargs) -> ToolError:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            description = action.format(**bound.arguments)
+            kind = "HttpError" if isinstance(err, HttpError) else "Exception"
+            # Let logging format the record only if a handler emits it
+            logger.error("Failed to %s. %s: %s", description, kind, err)
+            return ToolError(f"Failed to {description}. {kind}: {err}")
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await fn(*args, **kwargs)
+            except ToolError:
+                raise
+            except Exception as e:
+                raise to_tool_error(e, args, kwargs) from e
+
+        return wrapper
+
+    return decorator
+
+
+# Largest page size the Directory API accepts for groups and members list calls
+MAX_PAGE_SIZE = 200
+
+# Directory API accepts at most 1000 calls in a single batch request
+BATCH_LIMIT = 1000
+
+# Quota (429) and transient server errors are retried up to MAX_ATTEMPTS times in total. Server
+# errors are only retried for idempotent methods: a POST that failed with a 5xx may still have
+# been applied, and sending it again would fail with "already exists".
+MAX_ATTEMPTS = 3
+RETRYABLE_SERVER_STATUSES = frozenset({500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "PUT", "PATCH", "DELETE"})
+# Longest Retry-After wait honored on 429s; longer waits are returned to the caller instead
+MAX_RETRY_AFTER = 30.0
+
+DIRECTORY_API_ROOT = "https://admin.googleapis.com"
+DIRECTORY_V1_PATH = "/admin/directory/v1"
+
+# HTTP clients shared by every caller; each request carries its own bearer token.
+# HTTP/2 multiplexes concurrent tool calls over one connection per client, and spreading callers
+# round-robin over a few clients keeps a burst of calls from queueing on a single connection's
+# stream limit. Google only compresses responses for user agents that mention gzip.
+HTTP_POOL_SIZE = 4
+_HTTP_CLIENTS: tuple[httpx.AsyncClient, ...] = ()
+_HTTP_CLIENT_COUNTER = itertools.count()
+
+
+def open_http_clients(transport: httpx.AsyncBaseTransport | None = None) -> tuple[httpx.AsyncClient, ...]:
+    """Create the shared HTTP clients unless they are already open.
+
+    Args:
+        transport: Optional transport for the new clients, e.g. an httpx.MockTransport in tests
+
+    Returns:
+        The shared HTTP clients
+    """
+    global _HTTP_CLIENTS
+    if not _HTTP_CLIENTS:
+        _HTTP_CLIENTS = tuple(
+            httpx.AsyncClient(
+                base_url=DIRECTORY_API_ROOT,
+                http2=True,
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+                headers={"User-Agent": "google-groups-mcp (gzip)", "Accept-Encoding": "gzip"},
+                transport=transport,
+            )
+            for _ in range(HTTP_POOL_SIZE)
+        )
+    return _HTTP_CLIENTS
+
+
+async def close_http_clients() -> None:
+    """Close the shared HTTP clients; the next Directory API client opens new ones."""
+    global _HTTP_CLIENTS
+    clients, _HTTP_CLIENTS = _HTTP_CLIENTS, ()
+    for client in clients:
+        await client.aclose()
+
+
+def quote(value: str) -> str:
+    """URL-encode a value (e.g. an email address) for use in a REST path segment."""
+    return urllib.parse.quote(value, safe="")
+
+
+def _decode(status: int, reason: str, content: bytes, uri: str) -> dict:
+    if status >= 400:
+        try:
+            reason = orjson.loads(content)["error"]["message"]
+        except Exception:
+            pass
+        raise HttpError(status, reason, uri)
+    return orjson.loads(content) if content else {}
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    # Retry-After is either a number of seconds or an HTTP date
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
     try:
-        # Google Groups are managed via the Directory API
-        service = build(serviceName="admin", version="directory_v1", credentials=creds)
-        return service
-    except HttpError as err:
-        raise ToolError(f"Failed to build Google Directory API client. HttpError: {err}")
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _token_key(cred_token: str) -> str:
+    return hashlib.blake2b(cred_token.encode(), digest_size=16).hexdigest()
+
+
+class DirectoryClient:
+    """Google Directory API client bound to one access token.
 
+    Requests go through one of the shared HTTP clients, so creating a client is cheap. All
+    requests of one client use the same HTTP client, keeping e.g. pagination on one connection.
+    """
+
+    def __init__(self, cred_token: str):
+        clients = open_http_clients()
+        self._http = clients[next(_HTTP_CLIENT_COUNTER) % len(clients)]
+        # Identifies the caller in cache keys without keeping the raw token around
+        self.token_key = _token_key(cred_token)
+        self._headers = {"Authorization": f"Bearer {cred_token}"}
+        self._json_headers = {**self._headers, "Content-Type": "application/json"}
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        # Retry quota and transient server errors on the same pooled connection, backing off
+        # exponentially with jitter; the last attempt's response is returned as is
+        for attempt in range(MAX_ATTEMPTS):
+            response = await self._http.request(method, url, **kwargs)
+            if attempt == MAX_ATTEMPTS - 1:
+                return response
+            delay = (2**attempt) * 0.25 + random.random() * 0.1
+            if response.status_code == 429:
+                retry_after = _retry_after(response)
+                if retry_after is not None:
+                    if retry_after > MAX_RETRY_AFTER:
+                        return response
+                    delay = retry_after
+            elif response.status_code not in RETRYABLE_SERVER_STATUSES or method not in IDEMPOTENT_METHODS:
+                return response
+            await asyncio.sleep(delay)
+
+    async def request(self, method: str, path: str, params: dict | None = None, body: dict | None = None) -> dict:
+        """Send a single request to the Directory API.
+
+        Args:
+            method: HTTP method
+            path: Path below the Directory API root, e.g. "/groups"
+            params: Optional query parameters
+            body: Optional JSON body
+
+        Returns:
+            Decoded JSON response, or an empty dictionary for empty responses
+        """
+        if body is None:
+            headers, content = self._headers, None
+        else:
+            headers, content = self._json_headers, orjson.dumps(body)
+        response = await self._send(
+            method, DIRECTORY_V1_PATH + path, params=params, content=content, headers=headers
+        )
+        return _decode(response.status_code, response.reason_phrase, response.content, str(response.url))
+
+    async def batch(self, requests: list[tuple[str, str, dict | None]]) -> list[dict | HttpError]:
+        """Send up to `BATCH_LIMIT` requests as one multipart batch request.
+
+        Args:
+            requests: (method, path, body) of each request, with paths as for `request`
+
+        Returns:
+            Decoded response or HttpError for each request, in request order
+        """
+        boundary = f"batch_{uuid.uuid4().hex}"
+        parts = []
+        for i, (method, path, body) in enumerate(requests):
+            part = (
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <{i}>\r\n\r\n"
+                f"{method} {DIRECTORY_V1_PATH}{path} HTTP/1.1\r\n"
+            )
+            if body is not None:
+                part += f"Content-Type: application/json\r\n\r\n{orjson.dumps(body).decode()}\r\n"
+            else:
+                part += "\r\n"
+            parts.append(part)
+        payload = "".join(parts) + f"--{boundary}--\r\n"
+
+        response = await self._send(
+            "POST",
+            "/batch",
+            content=payload.encode(),
+            headers={**self._headers, "Content-Type": f"multipart/mixed; boundary={boundary}"},
+        )
+        if not response.is_success:
+            _decode(response.status_code, response.reason_phrase, response.content, str(response.url))
+
+        # Parse the multipart response the way googleapiclient does: decode it first, so UTF-8 text
+        # in the parts survives, and prepend the content type so the email parser sees a complete
+        # MIME message
+        content = response.content.decode(response.charset_encoding or "utf-8")
+        message = email.parser.Parser().parsestr(
+            f"content-type: {response.headers['content-type']}\r\n\r\n" + content
+        )
+        results: list[dict | HttpError | None] = [None] * len(requests)
+        for part in message.get_payload():
+            index = int(part["Content-ID"].strip("<>").removeprefix("response-"))
+            # Each part is a raw HTTP response: status line, headers, then the JSON body
+            status_line, _, raw_response = part.get_payload().partition("\n")
+            _, status, reason = (status_line.strip().split(" ", 2) + [""])[:3]
+            inner = email.parser.Parser().parsestr(raw_response)
+            method, path, _ = requests[index]
+            try:
+                results[index] = _decode(int(status), reason, inner.get_payload().encode("utf-8"), f"{method} {path}")
+            except HttpError as err:
+                results[index] = err
+        return [
+            result if result is not None else HttpError(500, "Missing from batch response", f"{method} {path}")
+            for result, (method, path, _) in zip(results, requests)
+        ]
+
+
+def get_client(cred_token: str) -> DirectoryClient:
+    """Create a Google Directory API client for Groups management.
+
+    Args:
+        cred_token: OAuth access token
+
+    Returns:
+        Google Directory API client
+    """
+    return DirectoryClient(cred_token)
+
+
+# Short-lived cache for idempotent reads, keyed by (function, token hash, arguments)
+_READ_CACHE = TTLCache(maxsize=1024, ttl=60)
+_READ_CACHE_LOCK = threading.Lock()
+_MISSING = object()
+
+
+def _cache_arg(value):
+    # Emails and domain names are case-insensitive in Google Workspace
+    return value.lower() if isinstance(value, str) else value
+
+
+def cached_read(fn):
+    """Cache the result of a read-only API coroutine that takes `service` as its first argument.
+
+    Cached entries are scoped to the access token the service was created with.
+    """
+    # Resolve parameter names and defaults once, so building a key doesn't bind the signature per call
+    parameters = list(inspect.signature(fn).parameters.values())[1:]
+    names = [p.name for p in parameters]
+    defaults = {p.name: p.default for p in parameters if p.default is not inspect.Parameter.empty}
+    fn_name = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(service, *args, **kwargs):
+        values = [*args, *(kwargs.get(name, defaults.get(name)) for name in names[len(args):])]
+        key = (fn_name, service.token_key, *map(_cache_arg, values))
+        with _READ_CACHE_LOCK:
+            # One lookup, so an entry can't expire between a membership test and the read
+            cached = _READ_CACHE.get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        result = await fn(service, *args, **kwargs)
+        with _READ_CACHE_LOCK:
+            _READ_CACHE[key] = result
+        return result
+
+    return wrapper
+
+
+def invalidate_cached_reads(fn_name: str | None = None, *args, token_key: str | None = None):
+    """Drop cached reads, for every access token unless `token_key` is given.
+
+    Args:
+        fn_name: Name of the cached function to invalidate; entries of all functions match if omitted
+        args: Leading arguments the entries must match, e.g. the group email
+        token_key: Only drop entries cached for this client's `token_key`
+
+    Returns:
+        Number of entries dropped
+    """
+    prefix = tuple(_cache_arg(a) for a in args)
+    with _READ_CACHE_LOCK:
+        if fn_name is None and token_key is None:
+            dropped = len(_READ_CACHE)
+            _READ_CACHE.clear()
+            return dropped
+        stale_keys = [
+            key for key in list(_READ_CACHE.keys())
+            if (fn_name is None or key[0] == fn_name)
+            and (token_key is None or key[1] == token_key)
+            and key[2:2 + len(prefix)] == prefix
+        ]
+        for key in stale_keys:
+            _READ_CACHE.pop(key, None)
+        return len(stale_keys)
@@ -1,10 +1,20 @@
 """Google Groups Members API operations"""
-from googleapiclient.errors import HttpError
-from fastmcp.exceptions import ToolError
-from .helper import logger
+from .helper import (
+    BATCH_LIMIT,
+    MAX_PAGE_SIZE,
+    HttpError,
+    cached_read,
+    invalidate_cached_reads,
+    handle_google_errors,
+    quote,
+)
 
+# Partial response mask for members list pages
+MEMBER_LIST_FIELDS = "members(id,email,role,type,status),nextPageToken"
 
-def list_members(service, group_email: str, max_results: int = 50, page_token: str | None = None):
+
+@handle_google_errors("list members for group {group_email}")
+async def list_members(service, group_email: str, max_results: int = 50, page_token: str | None = None):
     """List all members in a group.
     
     Args:
@@ -16,30 +26,47 @@ def list_members(service, group_email: str, max_results: int = 50, page_token: s
     Returns:
         Dictionary with members list and nextPageToken if available
     """
-    try:
-        params = {
-            "groupKey": group_email,
-            "maxResults": max_results,
-        }
-        
-        if page_token:
-            params["pageToken"] = page_token
-            
-        result = service.members().list(**params).execute()
+    params = {
+        "maxResults": max_results,
+        "fields": MEMBER_LIST_FIELDS,
+    }
+    
+    if page_token:
+        params["pageToken"] = page_token
         
-        return {
-            "members": result.get("members", []),
-            "nextPageToken": result.get("nextPageToken")
-        }
-    except HttpError as err:
-        logger.error(f"Failed to list members for group {group_email}. HttpError: {err}")
-        raise ToolError(f"Failed to list members for group {group_email}. HttpError: {err}")
-    except Exception as e:
-        logger.error(f"Failed to list members for group {group_email}. Exception: {e}")
-        raise ToolError(f"Failed to list members for group {group_email}. Exception: {e}")
-
-
-def get_member(service, group_email: str, member_email: str):
+    result = await service.request("GET", f"/groups/{quote(group_email)}/members", params=params)
+    
+    return {
+        "members": result.get("members", []),
+        "nextPageToken": result.get("nextPageToken")
+    }
+
+
+async def stream_members(service, group_email: str):
+    """Yield every member of a group one page at a time.
+
+    Pages are requested lazily, once the caller has consumed the previous one. The `fetch_all`
+    tools still collect every page into one result, so paging lazily enables progress reporting
+    between pages but does not bound the memory of that result.
+
+    Args:
+        service: Google Directory API service client
+        group_email: Email address of the group
+
+    Yields:
+        List of members in each page
+    """
+    page_token = None
+    while True:
+        result = await list_members(service, group_email, max_results=MAX_PAGE_SIZE, page_token=page_token)
+        yield result["members"]
+        page_token = result["nextPageToken"]
+        if not page_token:
+            return
+
+
+@handle_google_errors("get member {member_email} in group {group_email}")
+async def get_member(service, group_email: str, member_email: str):
     """Get details of a specific member in a group.
     
     Args:
@@ -50,18 +77,16 @@ def get_member(service, group_email: str, member_email: str):
     Returns:
         Dictionary with member details
     """
-    try:
-        member = service.members().get(groupKey=group_email, memberKey=member_email).execute()
-        return member
-    except HttpError as err:
-        logger.error(f"Failed to get member {member_email} in group {group_email}. HttpError: {err}")
-        raise ToolError(f"Failed to get member {member_email} in group {group_email}. HttpError: {err}")
-    except Exception as e:
-        logger.error(f"Failed to get member {member_email} in group {group_email}. Exception: {e}")
-        raise ToolError(f"Failed to get member {member_email} in group {group_email}. Exception: {e}")
+    member = await service.request(
+        "GET",
+        f"/groups/{quote(group_email)}/members/{quote(member_email)}",
+        params={"fields": "id,email,role,type,status"},
+    )
+    return member
 
 
-def add_member(service, group_email: str, member_email: str, role: str = "MEMBER"):
+@handle_google_errors("add member {member_email} to group {group_email}")
+async def add_member(service, group_email: str, member_email: str, role: str = "MEMBER"):
     """Add a member to a group.
     
     Args:
@@ -73,23 +98,18 @@ def add_member(service, group_email: str, member_email: str, role: str = "MEMBER
     Returns:
         Dictionary with added member details
     """
-    try:
-        member_body = {
-            "email": member_email,
-            "role": role
-        }
-        
-        member = service.members().insert(groupKey=group_email, body=member_body).execute()
-        return member
-    except HttpError as err:
-        logger.error(f"Failed to add member {member_email} to group {group_email}. HttpError: {err}")
-        raise ToolError(f"Failed to add member {member_email} to group {group_email}. HttpError: {err}")
-    except Exception as e:
-        logger.error(f"Failed to add member {member_email} to group {group_email}. Exception: {e}")
-        raise ToolError(f"Failed to add member {member_email} to group {group_email}. Exception: {e}")
+    member_body = {
+        "email": member_email,
+        "role": role
+    }
+    
+    member = await service.request("POST", f"/groups/{quote(group_email)}/members", body=member_body)
+    invalidate_cached_reads("has_member", group_email, member_email)
+    return member
 
 
-def update_member(service, group_email: str, member_email: str, role: str):
+@handle_google_errors("update member {member_email} in group {group_email}")
+async def update_member(service, group_email: str, member_email: str, role: str):
     """Update a member's role in a group.
     
     Args:
@@ -101,27 +121,21 @@ def update_member(service, group_email: str, member_email: str, role: str):
     Returns:
         Dictionary with updated member details
     """
-    try:
-        member_body = {
-            "email": member_email,
-            "role": role
-        }
-        
-        member = service.members().update(
-            groupKey=group_email, 
-            memberKey=member_email, 
-            body=member_body
-        ).execute()
-        return member
-    except HttpError as err:
-        logger.error(f"Failed to update member {member_email} in group {group_email}. HttpError: {err}")
-        raise ToolError(f"Failed to update member {member_email} in group {group_email}. HttpError: {err}")
-    except Exception as e:
-        logger.error(f"Failed to update member {member_email} in group {group_email}. Exception: {e}")
-        raise ToolError(f"Failed to update member {member_email} in group {group_email}. Exception: {e}")
-
-
-def remove_member(service, group_email: str, member_email: str):
+    member_body = {
+        "email": member_email,
+        "role": role
+    }
+    
+    member = await service.request(
+        "PUT",
+        f"/groups/{quote(group_email)}/members/{quote(member_email)}",
+        body=member_body,
+    )
+    return member
+
+
+@handle_google_errors("remove member {member_email} from group {group_email}")
+async def remove_member(service, group_email: str, member_email: str):
     """Remove a member from a group.
     
     Args:
@@ -132,18 +146,14 @@ def remove_member(service, group_email: str, member_email: str):
     Returns:
         Success message
     """
-    try:
-        service.members().delete(groupKey=group_email, memberKey=member_email).execute()
-        return f"Member {member_email} removed from group {group_email} successfully."
-    except HttpError as err:
-        logger.error(f"Failed to remove member {member_email} from group {group_email}. HttpError: {err}")
-        raise ToolError(f"Failed to remove member {member_email} from group {group_email}. HttpError: {err}")
-    except Exception as e:
-        logger.error(f"Failed to remove member {member_email} from group {group_email}. Exception: {e}")
-        raise ToolError(f"Failed to remove member {member_email} from group {group_email}. Exception: {e}")
+    await service.request("DELETE", f"/groups/{quote(group_email)}/members/{quote(member_email)}")
+    invalidate_cached_reads("has_member", group_email, member_email)
+    return f"Member {member_email} removed from group {group_email} successfully."
 
 
-def has_member(service, group_email: str, member_email: str):
+@cached_read
+@handle_google_errors("check membership of {member_email} in group {group_email}")
+async def has_member(service, group_email: str, member_email: str):
     """Check if a user is a member of a group.
     
     Args:
@@ -154,16 +164,118 @@ def has_member(service, group_email: str, member_email: str):
     Returns:
         Dictionary with membership status
     """
+    result = await service.request(
+        "GET", f"/groups/{quote(group_email)}/hasMember/{quote(member_email)}"
+    )
+    return result
+
+
+
+async def _execute_batch(service, member_emails: list[str], requests: list[tuple[str, str, dict | None]]):
+    """Execute member requests as HTTP batches of up to `BATCH_LIMIT` calls.
+
+    Args:
+        service: Google Directory API service client
+        member_emails: Email address of the member each request targets
+        requests: (method, path, body) of each request, in the same order as member_emails
+
+    Returns:
+        Dictionary with per-member successes and failures
+    """
+    successes = []
+    failures = []
+
+    for start in range(0, len(requests), BATCH_LIMIT):
+        chunk = requests[start:start + BATCH_LIMIT]
+        try:
+            results = await service.batch(chunk)
+        except Exception as err:
+            # HTTP errors, timeouts and malformed batch responses alike: earlier chunks are
+            # already applied, so report this chunk as failed instead of raising
+            if not start:
+                raise
+            results = [err] * len(chunk)
+        for member_email, result in zip(member_emails[start:start + BATCH_LIMIT], results):
+            if isinstance(result, HttpError):
+                failures.append({"email": member_email, "error": str(result)})
+            elif isinstance(result, Exception):
+                failures.append({"email": member_email, "error": f"{type(result).__name__}: {result}"})
+            else:
+                successes.append(result or {"email": member_email})
+
+    return {"successes": successes, "failures": failures}
+
+
+@handle_google_errors("bulk add members to group {group_email}")
+async def bulk_add_members(service, group_email: str, members: list[dict]):
+    """Add many members to a group using batched requests.
+
+    Args:
+        service: Google Directory API service client
+        group_email: Email address of the group
+        members: List of dictionaries with `email` and optional `role` (OWNER, MANAGER, MEMBER)
+
+    Returns:
+        Dictionary with added members and per-member failures
+    """
+    member_emails = [m["email"] for m in members]
+    requests = [
+        (
+            "POST",
+            f"/groups/{quote(group_email)}/members",
+            {"email": m["email"], "role": m.get("role", "MEMBER")},
+        )
+        for m in members
+    ]
     try:
-        result = service.members().hasMember(
-            groupKey=group_email, 
-            memberKey=member_email
-        ).execute()
-        return result
-    except HttpError as err:
-        logger.error(f"Failed to check membership of {member_email} in group {group_email}. HttpError: {err}")
-        raise ToolError(f"Failed to check membership of {member_email} in group {group_email}. HttpError: {err}")
-    except Exception as e:
-        logger.error(f"Failed to check membership of {member_email} in group {group_email}. Exception: {e}")
-        raise ToolError(f"Failed to check membership of {member_email} in group {group_email}. Exception: {e}")
+        return await _execute_batch(service, member_emails, requests)
+    finally:
+        # Earlier chunks may have changed membership even if a later one failed
+        invalidate_cached_reads("has_member", group_email)
+
+
+@handle_google_errors("bulk update members in group {group_email}")
+async def bulk_update_members(service, group_email: str, members: list[dict]):
+    """Update the roles of many members in a group using batched requests.
 
+    Args:
+        service: Google Directory API service client
+        group_email: Email address of the group
+        members: List of dictionaries with `email` and `role` (OWNER, MANAGER, MEMBER)
+
+    Returns:
+        Dictionary with updated members and per-member failures
+    """
+    member_emails = [m["email"] for m in members]
+    requests = [
+        (
+            "PUT",
+            f"/groups/{quote(group_email)}/members/{quote(m['email'])}",
+            {"email": m["email"], "role": m["role"]},
+        )
+        for m in members
+    ]
+    return await _execute_batch(service, member_emails, requests)
+
+
+@handle_google_errors("bulk remove members from group {group_email}")
+async def bulk_remove_members(service, group_email: str, member_emails: list[str]):
+    """Remove many members from a group using batched requests.
+
+    Args:
+        service: Google Directory API service client
+        group_email: Email address of the group
+        member_emails: Email addresses of the members to remove
+
+    Returns:
+        Dictionary with removed members and per-member failures
+    """
+    requests = [
+        ("DELETE", f"/groups/{quote(group_email)}/members/{quote(member_email)}", None)
+        for member_email in member_emails
+    ]
+    try:
+        return await _execute_batch(service, member_emails, requests)
+    finally:
+        # Earlier chunks may have changed membership even if a later one failed
+        invalidate_cached_reads("has_member", group_email)
@@ -1,13 +1,23 @@
-from fastmcp import FastMCP
-from pydantic import Field
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from fastmcp import Context, FastMCP
+from pydantic import BaseModel, Field
 from typing import Annotated, Literal
 import os
-from .apis.helper import setup_logger, get_client
-from googleapiclient.errors import HttpError
+import orjson
+from .apis.helper import (
+    setup_logger,
+    get_client,
+    close_http_clients,
+    invalidate_cached_reads,
+    handle_google_errors,
+)
 from fastmcp.exceptions import ToolError
 from fastmcp.server.dependencies import get_http_headers
+from fastmcp.server.middleware import Middleware, MiddlewareContext
 from .apis.groups import (
     list_groups,
+    stream_groups,
     get_group,
     create_group,
     update_group,
@@ -15,18 +25,22 @@ from .apis.groups import (
 )
 from .apis.members import (
     list_members,
+    stream_members,
     get_member,
     add_member,
     update_member,
     remove_member,
     has_member,
+    bulk_add_members,
+    bulk_update_members,
+    bulk_remove_members,
 )
 from .apis.domains import (
     list_domains,
     get_domain,
 )
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import Response
 
 logger = setup_logger(__name__)
 
@@ -34,25 +48,79 @@ logger = setup_logger(__name__)
 PORT = int(os.getenv("PORT", 9000))
 MCP_PATH = os.getenv("MCP_PATH", "/mcp/google-groups")
 
+# Shared parameter types for the group and member tools
+GroupEmailField = Annotated[str, Field(description="Email address of the group", min_length=1)]
+MemberEmailField = Annotated[str, Field(description="Email address of the member", min_length=1)]
+RoleField = Annotated[
+    Literal["OWNER", "MANAGER", "MEMBER"],
+    Field(description="Role of the member in the group")
+]
+
+# Access token and Directory API client of the tool call being served
+_token_ctx: ContextVar[str | None] = ContextVar("access_token", default=None)
+_service_ctx: ContextVar[object | None] = ContextVar("directory_service", default=None)
+
+
+class AccessTokenMiddleware(Middleware):
+    """Resolves the forwarded access token and its Directory API client once per tool call."""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        access_token = get_http_headers().get("x-forwarded-access-token", None)
+        token_reset = _token_ctx.set(access_token)
+        service_reset = _service_ctx.set(get_client(access_token) if access_token else None)
+        try:
+            return await call_next(context)
+        finally:
+            _service_ctx.reset(service_reset)
+            _token_ctx.reset(token_reset)
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Close the shared Directory API HTTP clients when the server shuts down."""
+    try:
+        yield {}
+    finally:
+        await close_http_clients()
+
+
 mcp = FastMCP(
     name="GoogleGroupsMCPServer",
     on_duplicate="error",
+    middleware=[AccessTokenMiddleware()],
+    lifespan=lifespan,
 )
 
 
+class GroupMemberRole(BaseModel):
+    email: MemberEmailField
+    role: RoleField = "MEMBER"
+
+
+class GroupMemberRoleUpdate(BaseModel):
+    email: MemberEmailField
+    role: RoleField
+
+
 def _get_access_token() -> str:
-    headers = get_http_headers()
-    access_token = headers.get("x-forwarded-access-token", None)
+    access_token = _token_ctx.get()
     if not access_token:
         raise ToolError(
-            "No access token found in headers, available headers: " + str(headers)
+            "No access token found in headers, available headers: " + str(get_http_headers())
         )
     return access_token
 
 
+def _get_service():
+    service = _service_ctx.get()
+    if service is None:
+        service = get_client(_get_access_token())
+    return service
+
+
 @mcp.custom_route("/health", methods=["GET"])
 async def health_check(request: Request):
-    return JSONResponse({"status": "healthy"})
+    return Response(content=orjson.dumps({"status": "healthy"}), media_type="application/json")
 
 
 @mcp.tool(
@@ -61,7 +129,8 @@ async def health_check(request: Request):
         "destructiveHint": False,
     },
 )
-def list_google_groups(
+@handle_google_errors("list Google Groups")
+async def list_google_groups(
     max_results: Annotated[
         int,
         Field(description="Maximum number of groups to return", ge=1, le=200)
@@ -74,19 +143,28 @@ def list_google_groups(
         str | None,
         Field(description="Optional token for pagination")
     ] = None,
+    fetch_all: Annotated[
+        bool,
+        Field(description="Return every group by following all pages; max_results is ignored")
+    ] = False,
+    ctx: Context | None = None,
 ) -> dict:
     """Lists all Google Groups in the domain. Returns a list of groups and a nextPageToken for pagination if available."""
-    try:
-        service = get_client(_get_access_token())
-        result = list_groups(
-            service, 
-            max_results=max_results, 
-            domain=domain, 
-            page_token=page_token
-        )
-        return result
-    except HttpError as err:
-        raise ToolError(f"Failed to list Google Groups. HttpError: {err}")
+    service = _get_service()
+    if fetch_all:
+        groups = []
+        async for page in stream_groups(service, domain=domain):
+            groups.extend(page)
+            if ctx is not None:
+                await ctx.report_progress(progress=len(groups))
+        return {"groups": groups, "nextPageToken": None}
+    result = await list_groups(
+        service,
+        max_results=max_results, 
+        domain=domain, 
+        page_token=page_token,
+    )
+    return result
 
 
 @mcp.tool(
@@ -95,49 +173,36 @@ def list_google_groups(
         "destructiveHint": False,
     },
 )
-def get_google_group(
-    group_email: Annotated[str, Field(description="Email address of the group to get")],
+@handle_google_errors("get Google Group")
+async def get_google_group(
+    group_email: GroupEmailField,
 ) -> dict:
     """Get details of a specific Google Group by its email address."""
-    if group_email == "":
-        raise ValueError("argument `group_email` can't be empty")
-    service = get_client(_get_access_token())
-    try:
-        group = get_group(service, group_email)
-        return group
-    except HttpError as err:
-        raise ToolError(f"Failed to get Google Group. HttpError: {err}")
-    except Exception as e:
-        raise ToolError(f"Failed to get Google Group. Exception: {e}")
+    service = _get_service()
+    group = await get_group(service, group_email)
+    return group
 
 
 @mcp.tool()
-def create_google_group(
-    email: Annotated[str, Field(description="Email address for the new group")],
-    name: Annotated[str, Field(description="Display name for the new group")],
+@handle_google_errors("create Google Group")
+async def create_google_group(
+    email: Annotated[str, Field(description="Email address for the new group", min_length=1)],
+    name: Annotated[str, Field(description="Display name for the new group", min_length=1)],
     description: Annotated[
         str,
         Field(description="Description for the new group")
     ] = "",
 ) -> dict:
     """Creates a new Google Group. Can only create groups with available domains in the Workspace account."""
-    if email == "":
-        raise ValueError("argument `email` can't be empty")
-    if name == "":
-        raise ValueError("argument `name` can't be empty")
-    service = get_client(_get_access_token())
-    try:
-        group = create_group(service, email, name, description)
-        return group
-    except HttpError as err:
-        raise ToolError(f"Failed to create Google Group. HttpError: {err}")
-    except Exception as e:
-        raise ToolError(f"Failed to create Google Group. Exception: {e}")
+    service = _get_service()
+    group = await create_group(service, email, name, description)
+    return group
 
 
 @mcp.tool()
-def update_google_group(
-    group_email: Annotated[str, Field(description="Email address of the group to update")],
+@handle_google_errors("update Google Group")
+async def update_google_group(
+    group_email: GroupEmailField,
     name: Annotated[
         str | None,
         Field(description="New display name for the group")
@@ -148,33 +213,20 @@ def update_google_group(
     ] = None,
 ) -> dict:
     """Updates an existing Google Group."""
-    if group_email == "":
-        raise ValueError("argument `group_email` can't be empty")
-    service = get_client(_get_access_token())
-    try:
-        group = update_group(service, group_email, name, description)
-        return group
-    except HttpError as err:
-        raise ToolError(f"Failed to update Google Group. HttpError: {err}")
-    except Exception as e:
-        raise ToolError(f"Failed to update Google Group. Exception: {e}")
+    service = _get_service()
+    group = await update_group(service, group_email, name, description)
+    return group
 
 
 @mcp.tool()
-def delete_google_group(
-    group_email: Annotated[str, Field(description="Email address of the group to delete")],
+@handle_google_errors("delete Google Group")
+async def delete_google_group(
+    group_email: GroupEmailField,
 ) -> str:
     """Deletes a Google Group"""
-    if group_email == "":
-        raise ValueError("argument `group_email` can't be empty")
-    service = get_client(_get_access_token())
-    try:
-        result = delete_group(service, group_email)
-        return result
-    except HttpError as err:
-        raise ToolError(f"Failed to delete Google Group. HttpError: {err}")
-    except Exception as e:
-        raise ToolError(f"Failed to delete Google Group. Exception: {e}")
+    service = _get_service()
+    result = await delete_group(service, group_email)
+    return result
 
 
 @mcp.tool(
@@ -183,8 +235,9 @@ def delete_google_group(
         "destructiveHint": False,
     },
 )
-def list_group_members(
-    group_email: Annotated[str, Field(description="Email address of the group")],
+@handle_google_errors("list members from group {group_email}")
+async def list_group_members(
+    group_email: GroupEmailField,
     max_results: Annotated[
         int,
         Field(description="Maximum number of members to return", ge=1, le=200)
@@ -193,22 +246,23 @@ def list_group_members(
         str | None,
         Field(description="Optional token for pagination")
     ] = None,
+    fetch_all: Annotated[
+        bool,
+        Field(description="Return every member by following all pages; max_results is ignored")
+    ] = False,
+    ctx: Context | None = None,
 ) -> dict:
     """Lists all members in a Google Group. Returns a list of members and a nextPageToken for pagination if available."""
-    if group_email == "":
-        raise ValueError("argument `group_email` can't be empty")
-    service = get_client(_get_access_token())
-    try:
-        result = list_members(service, group_email, max_results, page_token)
-        return result
-    except HttpError as err:
-        raise ToolError(
-            f"Failed to list members from group {group_email}. HttpError: {err}"
-        )
-    except Exception as e:
-        raise ToolError(
-            f"Failed to list members from group {group_email}. Exception: {e}"
-        )
+    service = _get_service()
+    if fetch_all:
+        members = []
+        async for page in stream_members(service, group_email):
+            members.extend(page)
+            if ctx is not None:
+                await ctx.report_progress(progress=len(members))
+        return {"members": members, "nextPageToken": None}
+    result = await list_members(service, group_email, max_results, page_token)
+    return result
 
 
 @mcp.tool(
@@ -217,107 +271,53 @@ def list_group_members(
         "destructiveHint": False,
     },
 )
-def get_group_member(
-    group_email: Annotated[str, Field(description="Email address of the group")],
-    member_email: Annotated[str, Field(description="Email address of the member")],
+@handle_google_errors("get member {member_email} from group {group_email}")
+async def get_group_member(
+    group_email: GroupEmailField,
+    member_email: MemberEmailField,
 ) -> dict:
     """Gets details of a specific member in a Google Group."""
-    if group_email == "":
-        raise ValueError("argument `group_email` can't be empty")
-    if member_email == "":
-        raise ValueError("argument `member_email` can't be empty")
-    service = get_client(_get_access_token())
-    try:
-        member = get_member(service, group_email, member_email)
-        return member
-    except HttpError as err:
-        raise ToolError(
-            f"Failed to get member {member_email} from group {group_email}. HttpError: {err}"
-        )
-    except Exception as e:
-        raise ToolError(
-            f"Failed to get member {member_email} from group {group_email}. Exception: {e}"
-        )
+    service = _get_service()
+    member = await get_member(service, group_email, member_email)
+    return member
 
 
 @mcp.tool()
-def add_group_member(
-    group_email: Annotated[str, Field(description="Email address of the group")],
-    member_email: Annotated[str, Field(description="Email address of the member to add")],
-    role: Annotated[
-        Literal["OWNER", "MANAGER", "MEMBER"],
-        Field(description="Role of the member in the group")
-    ] = "MEMBER",
+@handle_google_errors("add member {member_email} to group {group_email}")
+async def add_group_member(
+    group_email: GroupEmailField,
+    member_email: MemberEmailField,
+    role: RoleField = "MEMBER",
 ) -> dict:
     """Adds a member to a Google Group."""
-    if group_email == "":
-        raise ValueError("argument `group_email` can't be empty")
-    if member_email == "":
-        raise ValueError("argument `member_email` can't be empty")
-    service = get_client(_get_access_token())
-    try:
-        member = add_member(service, group_email, member_email, role)
-        return member
-    except HttpError as err:
-        raise ToolError(
-            f"Failed to add member {member_email} to group {group_email}. HttpError: {err}"
-        )
-    except Exception as e:
-        raise ToolError(
-            f"Failed to add member {member_email} to group {group_email}. Exception: {e}"
-        )
+    service = _get_service()
+    member = await add_member(service, group_email, member_email, role)
+    return member
 
 
 @mcp.tool()
-def update_group_member(
-    group_email: Annotated[str, Field(description="Email address of the group")],
-    member_email: Annotated[str, Field(description="Email address of the member to update")],
-    role: Annotated[
-        Literal["OWNER", "MANAGER", "MEMBER"],
-        Field(description="New role for the member")
-    ],
+@handle_google_errors("update member {member_email} in group {group_email}")
+async def update_group_member(
+    group_email: GroupEmailField,
+    member_email: MemberEmailField,
+    role: RoleField,
 ) -> dict:
     """Updates a member's role in a Google Group."""
-    if group_email == "":
-        raise ValueError("argument `group_email` can't be empty")
-    if member_email == "":
-        raise ValueError("argument `member_email` can't be empty")
-    service = get_client(_get_access_token())
-    try:
-        member = update_member(service, group_email, member_email, role)
-        return member
-    except HttpError as err:
-        raise ToolError(
-            f"Failed to update member {member_email} in group {group_email}. HttpError: {err}"
-        )
-    except Exception as e:
-        raise ToolError(
-            f"Failed to update member {member_email} in group {group_email}. Exception: {e}"
-        )
+    service = _get_service()
+    member = await update_member(service, group_email, member_email, role)
+    return member
 
 
 @mcp.tool()
-def remove_group_member(
-    group_email: Annotated[str, Field(description="Email address of the group")],
-    member_email: Annotated[str, Field(description="Email address of the member to remove")],
+@handle_google_errors("remove member {member_email} from group {group_email}")
+async def remove_group_member(
+    group_email: GroupEmailField,
+    member_email: MemberEmailField,
 ) -> str:
     """Removes a member from a Google Group."""
-    if group_email == "":
-        raise ValueError("argument `group_email` can't be empty")
-    if member_email == "":
-        raise ValueError("argument `member_email` can't be empty")
-    service = get_client(_get_access_token())
-    try:
-        result = remove_member(service, group_email, member_email)
-        return result
-    except HttpError as err:
-        raise ToolError(
-            f"Failed to remove member {member_email} from group {group_email}. HttpError: {err}"
-        )
-    except Exception as e:
-        raise ToolError(
-            f"Failed to remove member {member_email} from group {group_email}. Exception: {e}"
-        )
+    service = _get_service()
+    result = await remove_member(service, group_email, member_email)
+    return result
 
 
 @mcp.tool(
@@ -326,27 +326,60 @@ def remove_group_member(
         "destructiveHint": False,
     },
 )
-def check_group_membership(
-    group_email: Annotated[str, Field(description="Email address of the group")],
-    member_email: Annotated[str, Field(description="Email address to check")],
+@handle_google_errors("check membership of {member_email} in group {group_email}")
+async def check_group_membership(
+    group_email: GroupEmailField,
+    member_email: MemberEmailField,
 ) -> dict:
     """Checks if a user is a member of a Google Group."""
-    if group_email == "":
-        raise ValueError("argument `group_email` can't be empty")
-    if member_email == "":
-        raise ValueError("argument `member_email` can't be empty")
-    service = get_client(_get_access_token())
-    try:
-        result = has_member(service, group_email, member_email)
-        return result
-    except HttpError as err:
-        raise ToolError(
-            f"Failed to check membership of {member_email} in group {group_email}. HttpError: {err}"
-        )
-    except Exception as e:
-        raise ToolError(
-            f"Failed to check membership of {member_email} in group {group_email}. Exception: {e}"
-        )
+    service = _get_service()
+    result = await has_member(service, group_email, member_email)
+    return result
+
+
+@mcp.tool()
+@handle_google_errors("bulk add members to group {group_email}")
+async def bulk_add_group_members(
+    group_email: GroupEmailField,
+    members: Annotated[
+        list[GroupMemberRole],
+        Field(description="Members to add, each with an email and an optional role", min_length=1)
+    ],
+) -> dict:
+    """Adds many members to a Google Group in batched requests. Returns the added members and any per-member failures."""
+    service = _get_service()
+    result = await bulk_add_members(service, group_email, [m.model_dump() for m in members])
+    return result
+
+
+@mcp.tool()
+@handle_google_errors("bulk update members in group {group_email}")
+async def bulk_update_group_members(
+    group_email: GroupEmailField,
+    members: Annotated[
+        list[GroupMemberRoleUpdate],
+        Field(description="Members to update, each with an email and the new role", min_length=1)
+    ],
+) -> dict:
+    """Updates the roles of many members in a Google Group in batched requests. Returns the updated members and any per-member failures."""
+    service = _get_service()
+    result = await bulk_update_members(service, group_email, [m.model_dump() for m in members])
+    return result
+
+
+@mcp.tool()
+@handle_google_errors("bulk remove members from group {group_email}")
+async def bulk_remove_group_members(
+    group_email: GroupEmailField,
+    member_emails: Annotated[
+        list[MemberEmailField],
+        Field(description="Email addresses of the members to remove", min_length=1)
+    ],
+) -> dict:
+    """Removes many members from a Google Group in batched requests. Returns the removed members and any per-member failures."""
+    service = _get_service()
+    result = await bulk_remove_members(service, group_email, member_emails)
+    return result
 
 
 @mcp.tool(
@@ -355,14 +388,12 @@ def check_group_membership(
         "destructiveHint": False,
     },
 )
-def list_google_domains() -> dict:
+@handle_google_errors("list domains")
+async def list_google_domains() -> dict:
     """Lists all domains in the Google Workspace account. This is useful to see which domains are available for creating groups."""
-    try:
-        service = get_client(_get_access_token())
-        result = list_domains(service)
-        return result
-    except HttpError as err:
-        raise ToolError(f"Failed to list domains. HttpError: {err}")
+    service = _get_service()
+    result = await list_domains(service)
+    return result
 
 
 @mcp.tool(
@@ -371,19 +402,22 @@ def list_google_domains() -> dict:
         "destructiveHint": False,
     },
 )
-def get_google_domain(
-    domain_name: Annotated[str, Field(description="The domain name to retrieve details for")],
+@handle_google_errors("get domain {domain_name}")
+async def get_google_domain(
+    domain_name: Annotated[str, Field(description="The domain name to retrieve details for", min_length=1)],
 ) -> dict:
     """Get details of a specific domain in the Google Workspace account."""
-    if domain_name == "":
-        raise ToolError("domain_name cannot be empty")
-    
-    try:
-        service = get_client(_get_access_token())
-        result = get_domain(service, domain_name)
-        return result
-    except HttpError as err:
-        raise ToolError(f"Failed to get domain {domain_name}. HttpError: {err}")
+    service = _get_service()
+    result = await get_domain(service, domain_name)
+    return result
+
+
+@mcp.tool()
+async def invalidate_cache() -> str:
+    """Clears cached results of group, membership and domain lookups made with the current access token, so the next calls fetch fresh data from Google."""
+    service = _get_service()
+    dropped = invalidate_cached_reads(token_key=service.token_key)
+    return f"Cleared {dropped} cached entries."
 
 
 def streamable_http_server():
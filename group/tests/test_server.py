@@ -0,0 +1,737 @@
+import pytest
+import pytest_asyncio
+import httpx
+import orjson
+import email.parser
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+import sys
+import os
+from unittest.mock import patch
+
+# Add the parent directory to the Python path so we can import from app
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from app import server
+from app.apis import helper, groups, members, domains
+
+# Configure pytest for async support
+pytestmark = pytest.mark.asyncio
+
+API = "/admin/directory/v1"
+
+
+class FakeDirectoryAPI:
+    """Records requests sent to the Directory API and replies with queued responses"""
+
+    def __init__(self):
+        self.requests = []
+        self.responses = []
+
+    def reply(self, *responses):
+        self.responses.extend(responses)
+
+    def handler(self, request):
+        self.requests.append(request)
+        if not self.responses:
+            return httpx.Response(200, json={})
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def request_path(request):
+    """Path of a request as sent on the wire, i.e. still percent-encoded"""
+    return request.url.raw_path.decode().partition("?")[0]
+
+
+def batch_response(parts, boundary="batch_response"):
+    """Build a multipart batch response from (content_id, status_line, body) tuples"""
+    content = ""
+    for content_id, status_line, body in parts:
+        content += (
+            f"--{boundary}\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <response-{content_id}>\r\n\r\n"
+            f"HTTP/1.1 {status_line}\r\n"
+        )
+        if body is not None:
+            content += f"Content-Type: application/json; charset=UTF-8\r\n\r\n{orjson.dumps(body).decode()}\r\n"
+        else:
+            content += "\r\n"
+    content += f"--{boundary}--\r\n"
+    return httpx.Response(
+        200,
+        content=content.encode(),
+        headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+    )
+
+
+def batch_request_parts(request):
+    """Split a multipart batch request into (Content-ID, request line, JSON body) tuples"""
+    message = email.parser.BytesParser().parsebytes(
+        f"content-type: {request.headers['content-type']}\r\n\r\n".encode() + request.content
+    )
+    parts = []
+    for part in message.get_payload():
+        request_line, _, rest = part.get_payload().partition("\r\n")
+        body = email.parser.Parser().parsestr(rest).get_payload()
+        parts.append((part["Content-ID"], request_line, orjson.loads(body) if body.strip() else None))
+    return parts
+
+
+# Fixtures
+@pytest_asyncio.fixture
+async def directory_api():
+    """Route every Directory API call to a fake API"""
+    api = FakeDirectoryAPI()
+    await helper.close_http_clients()
+    helper.invalidate_cached_reads()
+    helper.open_http_clients(transport=httpx.MockTransport(api.handler))
+    yield api
+    await helper.close_http_clients()
+    helper.invalidate_cached_reads()
+
+
+@pytest.fixture
+def service(directory_api):
+    """Directory API client for a test token"""
+    return helper.get_client("test_token")
+
+
+# Integration Tests - Testing the MCP Server
+class TestMCPServer:
+    """Test the FastMCP server integration"""
+
+    async def test_health_check(self):
+        response = await server.health_check(None)
+
+        assert response.status_code == 200
+        assert response.media_type == "application/json"
+        assert orjson.loads(response.body) == {"status": "healthy"}
+
+    async def test_bulk_update_requires_role(self, directory_api):
+        async with Client(server.mcp) as client:
+            with pytest.raises(ToolError, match="role"):
+                await client.call_tool(
+                    "bulk_update_group_members",
+                    {"group_email": "team@example.com", "members": [{"email": "a@example.com"}]},
+                )
+
+        assert directory_api.requests == []
+
+    async def test_lifespan_closes_http_clients(self, directory_api):
+        clients = helper.open_http_clients()
+        assert len(clients) == helper.HTTP_POOL_SIZE
+
+        async with server.lifespan(server.mcp):
+            pass
+
+        assert all(client.is_closed for client in clients)
+        # The next client opens a fresh pool
+        assert not helper.get_client("test_token")._http.is_closed
+
+
+class TestToolCalls:
+    """Test calling tools through the MCP server with a forwarded access token"""
+
+    @pytest.fixture
+    def headers(self):
+        """Forwarded request headers seen by the server"""
+        headers = {"x-forwarded-access-token": "header_token"}
+        with patch("app.server.get_http_headers", return_value=headers):
+            yield headers
+
+    async def test_forwarded_token_reaches_api(self, directory_api, headers):
+        directory_api.reply(httpx.Response(200, json={"id": "group_id"}))
+
+        async with Client(server.mcp) as client:
+            result = await client.call_tool("get_google_group", {"group_email": "team@example.com"})
+
+        assert result.data == {"id": "group_id"}
+        assert directory_api.requests[0].headers["Authorization"] == "Bearer header_token"
+        # The middleware resets the per-call state afterwards
+        assert server._token_ctx.get() is None
+        assert server._service_ctx.get() is None
+
+    async def test_missing_token_raises(self, directory_api, headers):
+        headers.clear()
+
+        with pytest.raises(ToolError, match="No access token found in headers"):
+            async with Client(server.mcp) as client:
+                await client.call_tool("get_google_group", {"group_email": "team@example.com"})
+
+        assert directory_api.requests == []
+
+    async def test_get_service_falls_back_to_token(self, directory_api):
+        reset = server._token_ctx.set("direct_token")
+        try:
+            service = server._get_service()
+        finally:
+            server._token_ctx.reset(reset)
+
+        assert service.token_key == helper.get_client("direct_token").token_key
+
+    async def test_invalidate_cache_drops_only_callers_entries(self, directory_api, headers):
+        await groups.get_group(helper.get_client("header_token"), "team@example.com")
+        await groups.get_group(helper.get_client("other_token"), "team@example.com")
+
+        async with Client(server.mcp) as client:
+            result = await client.call_tool("invalidate_cache", {})
+
+        assert result.data == "Cleared 1 cached entries."
+        await groups.get_group(helper.get_client("other_token"), "team@example.com")
+        assert len(directory_api.requests) == 2
+
+    @pytest.mark.parametrize(
+        "tool, arguments",
+        [
+            ("get_google_group", {"group_email": ""}),
+            ("remove_group_member", {"group_email": "team@example.com", "member_email": ""}),
+            ("create_google_group", {"email": "team@example.com", "name": ""}),
+            ("bulk_remove_group_members", {"group_email": "team@example.com", "member_emails": []}),
+            ("get_google_domain", {"domain_name": ""}),
+        ],
+    )
+    async def test_empty_arguments_rejected(self, directory_api, headers, tool, arguments):
+        with pytest.raises(ToolError):
+            async with Client(server.mcp) as client:
+                await client.call_tool(tool, arguments)
+
+        assert directory_api.requests == []
+
+    async def test_fetch_all_returns_every_page_with_progress(self, directory_api, headers):
+        directory_api.reply(
+            httpx.Response(200, json={"members": [{"id": "1"}, {"id": "2"}], "nextPageToken": "page_2"}),
+            httpx.Response(200, json={"members": [{"id": "3"}]}),
+        )
+        progress = []
+
+        async def progress_handler(current, total, message):
+            progress.append(current)
+
+        async with Client(server.mcp, progress_handler=progress_handler) as client:
+            result = await client.call_tool(
+                "list_group_members", {"group_email": "team@example.com", "fetch_all": True}
+            )
+
+        assert result.data == {"members": [{"id": "1"}, {"id": "2"}, {"id": "3"}], "nextPageToken": None}
+        assert len(directory_api.requests) == 2
+        assert progress == [2, 3]
+
+
+class TestDirectoryClient:
+    """Test the REST client for the Directory API"""
+
+    async def test_request_sends_bearer_token(self, directory_api, service):
+        directory_api.reply(httpx.Response(200, json={"id": "group_id"}))
+
+        result = await service.request("GET", "/groups/x", params={"fields": "id"})
+
+        assert result == {"id": "group_id"}
+        request = directory_api.requests[0]
+        assert request.headers["Authorization"] == "Bearer test_token"
+        assert request.url.params["fields"] == "id"
+
+    async def test_request_sends_json_body(self, directory_api, service):
+        await service.request("POST", "/groups", body={"email": "team@example.com"})
+
+        request = directory_api.requests[0]
+        assert request.headers["Content-Type"] == "application/json"
+        assert orjson.loads(request.content) == {"email": "team@example.com"}
+
+    async def test_request_empty_204_body(self, directory_api, service):
+        directory_api.reply(httpx.Response(204))
+
+        assert await service.request("DELETE", "/groups/x") == {}
+
+    async def test_request_decodes_google_error_message(self, directory_api, service):
+        directory_api.reply(
+            httpx.Response(404, json={"error": {"code": 404, "message": "Resource Not Found: groupKey"}})
+        )
+
+        with pytest.raises(helper.HttpError) as exc_info:
+            await service.request("GET", "/groups/missing")
+
+        assert exc_info.value.status == 404
+        assert exc_info.value.reason == "Resource Not Found: groupKey"
+        assert "missing" in exc_info.value.uri
+
+    async def test_request_error_without_json_body_keeps_reason(self, directory_api, service):
+        directory_api.reply(httpx.Response(403, content=b"<html>Forbidden</html>"))
+
+        with pytest.raises(helper.HttpError) as exc_info:
+            await service.request("GET", "/groups/x")
+
+        assert exc_info.value.status == 403
+        assert exc_info.value.reason == "Forbidden"
+
+    async def test_batch_encodes_one_part_per_request(self, directory_api, service):
+        directory_api.reply(batch_response([(0, "200 OK", {"id": "a"}), (1, "204 No Content", None)]))
+
+        await service.batch([
+            ("POST", "/groups/g/members", {"email": "a@example.com"}),
+            ("DELETE", "/groups/g/members/b", None),
+        ])
+
+        request = directory_api.requests[0]
+        assert request.method == "POST"
+        assert request_path(request) == "/batch"
+        assert request.headers["Authorization"] == "Bearer test_token"
+        assert batch_request_parts(request) == [
+            ("<0>", f"POST {API}/groups/g/members HTTP/1.1", {"email": "a@example.com"}),
+            ("<1>", f"DELETE {API}/groups/g/members/b HTTP/1.1", None),
+        ]
+
+    async def test_batch_maps_content_ids_to_request_order(self, directory_api, service):
+        directory_api.reply(batch_response([
+            (2, "200 OK", {"id": "c"}),
+            (0, "200 OK", {"id": "a"}),
+            (1, "204 No Content", None),
+        ]))
+
+        results = await service.batch([
+            ("GET", "/groups/a", None),
+            ("DELETE", "/groups/b", None),
+            ("GET", "/groups/c", None),
+        ])
+
+        assert results == [{"id": "a"}, {}, {"id": "c"}]
+
+    async def test_batch_part_errors_become_http_errors(self, directory_api, service):
+        directory_api.reply(batch_response([
+            (0, "200 OK", {"id": "a"}),
+            (1, "409 Conflict", {"error": {"code": 409, "message": "Member already exists."}}),
+        ]))
+
+        results = await service.batch([
+            ("POST", "/groups/g/members", {"email": "a@example.com"}),
+            ("POST", "/groups/g/members", {"email": "b@example.com"}),
+        ])
+
+        assert results[0] == {"id": "a"}
+        assert isinstance(results[1], helper.HttpError)
+        assert results[1].status == 409
+        assert results[1].reason == "Member already exists."
+        assert results[1].uri == "POST /groups/g/members"
+
+    async def test_batch_keeps_non_ascii_text(self, directory_api, service):
+        directory_api.reply(batch_response([
+            (0, "200 OK", {"email": "jürgen@example.com", "name": "Jürgen – Team"}),
+            (1, "409 Conflict", {"error": {"code": 409, "message": "Mitglied existiert bereits – Jürgen"}}),
+        ]))
+
+        results = await service.batch([
+            ("POST", "/groups/g/members", {"email": "jürgen@example.com"}),
+            ("POST", "/groups/g/members", {"email": "jürgen@example.com"}),
+        ])
+
+        assert results[0] == {"email": "jürgen@example.com", "name": "Jürgen – Team"}
+        assert results[1].reason == "Mitglied existiert bereits – Jürgen"
+
+    async def test_batch_missing_parts_become_http_errors(self, directory_api, service):
+        directory_api.reply(batch_response([(0, "200 OK", {"id": "a"})]))
+
+        results = await service.batch([("GET", "/groups/a", None), ("GET", "/groups/b", None)])
+
+        assert results[0] == {"id": "a"}
+        assert isinstance(results[1], helper.HttpError)
+        assert results[1].status == 500
+        assert results[1].uri == "GET /groups/b"
+
+    async def test_batch_outer_error_raises(self, directory_api, service):
+        directory_api.reply(httpx.Response(401, json={"error": {"code": 401, "message": "Invalid Credentials"}}))
+
+        with pytest.raises(helper.HttpError) as exc_info:
+            await service.batch([("GET", "/groups/a", None)])
+
+        assert exc_info.value.reason == "Invalid Credentials"
+
+
+class TestRetries:
+    """Test retrying quota and transient server errors"""
+
+    @pytest.fixture
+    def sleeps(self, monkeypatch):
+        """Record backoff delays instead of sleeping"""
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr(helper.asyncio, "sleep", fake_sleep)
+        return delays
+
+    async def test_retries_then_succeeds(self, directory_api, service, sleeps):
+        directory_api.reply(httpx.Response(503), httpx.Response(500), httpx.Response(200, json={"id": "a"}))
+
+        assert await service.request("GET", "/groups/a") == {"id": "a"}
+
+        assert len(directory_api.requests) == 3
+        assert len(sleeps) == 2
+        assert 0.25 <= sleeps[0] <= 0.35
+        assert 0.5 <= sleeps[1] <= 0.6
+
+    async def test_gives_up_after_max_attempts(self, directory_api, service, sleeps):
+        directory_api.reply(*[
+            httpx.Response(503, json={"error": {"code": 503, "message": "Backend Error"}})
+            for _ in range(helper.MAX_ATTEMPTS + 1)
+        ])
+
+        with pytest.raises(helper.HttpError) as exc_info:
+            await service.request("DELETE", "/groups/a")
+
+        assert exc_info.value.status == 503
+        assert exc_info.value.reason == "Backend Error"
+        assert len(directory_api.requests) == helper.MAX_ATTEMPTS
+        assert len(sleeps) == helper.MAX_ATTEMPTS - 1
+
+    async def test_post_not_retried_on_server_error(self, directory_api, service, sleeps):
+        directory_api.reply(httpx.Response(503), httpx.Response(200, json={}))
+
+        with pytest.raises(ToolError):
+            await members.add_member(service, "team@example.com", "user@example.com")
+
+        assert len(directory_api.requests) == 1
+        assert sleeps == []
+
+    async def test_batch_not_retried_on_server_error(self, directory_api, service, sleeps):
+        directory_api.reply(httpx.Response(502), batch_response([(0, "204 No Content", None)]))
+
+        with pytest.raises(helper.HttpError):
+            await service.batch([("DELETE", "/groups/g/members/a", None)])
+
+        assert len(directory_api.requests) == 1
+
+    async def test_post_retried_on_quota_error_after_retry_after(self, directory_api, service, sleeps):
+        directory_api.reply(
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(200, json={"email": "team@example.com"}),
+        )
+
+        assert await groups.create_group(service, "team@example.com", "Team") == {"email": "team@example.com"}
+
+        assert len(directory_api.requests) == 2
+        assert sleeps == [2.0]
+
+    async def test_quota_error_without_retry_after_backs_off(self, directory_api, service, sleeps):
+        directory_api.reply(httpx.Response(429), httpx.Response(200, json={}))
+
+        await service.request("GET", "/groups/a")
+
+        assert len(directory_api.requests) == 2
+        assert 0.25 <= sleeps[0] <= 0.35
+
+    async def test_long_retry_after_is_not_waited_for(self, directory_api, service, sleeps):
+        directory_api.reply(httpx.Response(429, headers={"Retry-After": "3600"}), httpx.Response(200, json={}))
+
+        with pytest.raises(helper.HttpError) as exc_info:
+            await service.request("GET", "/groups/a")
+
+        assert exc_info.value.status == 429
+        assert len(directory_api.requests) == 1
+        assert sleeps == []
+
+    async def test_client_errors_not_retried(self, directory_api, service, sleeps):
+        directory_api.reply(httpx.Response(404), httpx.Response(200, json={}))
+
+        with pytest.raises(helper.HttpError):
+            await service.request("GET", "/groups/a")
+
+        assert len(directory_api.requests) == 1
+
+
+class TestReadCache:
+    """Test caching of idempotent reads and invalidation on writes"""
+
+    async def test_reads_are_cached_per_token(self, directory_api):
+        directory_api.reply(
+            httpx.Response(200, json={"id": "first"}),
+            httpx.Response(200, json={"id": "second"}),
+        )
+        first, second = helper.get_client("token_a"), helper.get_client("token_b")
+
+        assert await groups.get_group(first, "team@example.com") == {"id": "first"}
+        assert await groups.get_group(second, "team@example.com") == {"id": "second"}
+        assert await groups.get_group(helper.get_client("token_a"), "team@example.com") == {"id": "first"}
+
+        assert len(directory_api.requests) == 2
+        assert directory_api.requests[1].headers["Authorization"] == "Bearer token_b"
+
+    async def test_cache_keys_are_case_insensitive(self, directory_api, service):
+        directory_api.reply(httpx.Response(200, json={"isMember": True}))
+
+        await members.has_member(service, "Team@Example.com", "User@Example.com")
+        result = await members.has_member(service, "team@example.com", "user@example.com")
+
+        assert result == {"isMember": True}
+        assert len(directory_api.requests) == 1
+
+    async def test_errors_are_not_cached(self, directory_api, service):
+        directory_api.reply(httpx.Response(404), httpx.Response(200, json={"id": "group_id"}))
+
+        with pytest.raises(ToolError):
+            await groups.get_group(service, "team@example.com")
+        assert await groups.get_group(service, "team@example.com") == {"id": "group_id"}
+
+        assert len(directory_api.requests) == 2
+
+    @pytest.mark.parametrize(
+        "write, method",
+        [
+            (lambda s: groups.update_group(s, "team@example.com", name="Team"), "PATCH"),
+            (lambda s: groups.delete_group(s, "team@example.com"), "DELETE"),
+        ],
+    )
+    async def test_group_writes_drop_cached_group(self, directory_api, service, write, method):
+        await groups.get_group(service, "team@example.com")
+        await write(service)
+        await groups.get_group(service, "team@example.com")
+
+        assert [r.method for r in directory_api.requests] == ["GET", method, "GET"]
+
+    @pytest.mark.parametrize(
+        "write",
+        [
+            lambda s: groups.delete_group(s, "team@example.com"),
+            lambda s: members.add_member(s, "team@example.com", "user@example.com"),
+            lambda s: members.remove_member(s, "team@example.com", "user@example.com"),
+        ],
+    )
+    async def test_membership_writes_drop_cached_membership(self, directory_api, service, write):
+        await members.has_member(service, "team@example.com", "user@example.com")
+        await write(service)
+        await members.has_member(service, "team@example.com", "user@example.com")
+
+        assert len(directory_api.requests) == 3
+
+    async def test_member_writes_keep_other_cached_reads(self, directory_api, service):
+        await members.has_member(service, "team@example.com", "other@example.com")
+        await members.has_member(service, "other@example.com", "user@example.com")
+        await members.add_member(service, "team@example.com", "user@example.com")
+        await members.has_member(service, "team@example.com", "other@example.com")
+        await members.has_member(service, "other@example.com", "user@example.com")
+
+        assert len(directory_api.requests) == 3
+
+    async def test_bulk_writes_drop_membership_when_later_chunk_fails(self, directory_api, service, monkeypatch):
+        monkeypatch.setattr(members, "BATCH_LIMIT", 1)
+        await members.has_member(service, "team@example.com", "a@example.com")
+        directory_api.reply(
+            batch_response([(0, "204 No Content", None)]),
+            httpx.Response(503, json={"error": {"code": 503, "message": "Backend Error"}}),
+        )
+
+        result = await members.bulk_remove_members(service, "team@example.com", ["a@example.com", "b@example.com"])
+
+        assert result["successes"] == [{"email": "a@example.com"}]
+        assert [f["email"] for f in result["failures"]] == ["b@example.com"]
+        assert "Backend Error" in result["failures"][0]["error"]
+        await members.has_member(service, "team@example.com", "a@example.com")
+        assert len(directory_api.requests) == 4
+
+    async def test_bulk_writes_drop_membership_when_first_chunk_fails(self, directory_api, service):
+        await members.has_member(service, "team@example.com", "a@example.com")
+        directory_api.reply(httpx.Response(401, json={"error": {"code": 401, "message": "Invalid Credentials"}}))
+
+        with pytest.raises(ToolError, match="Invalid Credentials"):
+            await members.bulk_add_members(service, "team@example.com", [{"email": "a@example.com"}])
+        await members.has_member(service, "team@example.com", "a@example.com")
+
+        assert len(directory_api.requests) == 3
+
+    async def test_invalidate_cached_reads_by_prefix(self, directory_api, service):
+        await groups.get_group(service, "team@example.com")
+        await members.has_member(service, "team@example.com", "a@example.com")
+        await members.has_member(service, "other@example.com", "a@example.com")
+
+        assert helper.invalidate_cached_reads("has_member", "Team@Example.com") == 1
+        assert helper.invalidate_cached_reads() == 2
+
+    async def test_invalidate_cached_reads_by_token(self, directory_api):
+        first, second = helper.get_client("token_a"), helper.get_client("token_b")
+        await groups.get_group(first, "team@example.com")
+        await members.has_member(first, "team@example.com", "a@example.com")
+        await groups.get_group(second, "team@example.com")
+
+        assert helper.invalidate_cached_reads("get_group", token_key=first.token_key) == 1
+        assert helper.invalidate_cached_reads(token_key=first.token_key) == 1
+        assert helper.invalidate_cached_reads() == 1
+
+
+class TestEndpoints:
+    """Test the REST method and path each API function sends"""
+
+    @pytest.mark.parametrize(
+        "call, method, path",
+        [
+            (lambda s: groups.list_groups(s), "GET", f"{API}/groups"),
+            (lambda s: groups.get_group(s, "team+dev@example.com"), "GET", f"{API}/groups/team%2Bdev%40example.com"),
+            (lambda s: groups.create_group(s, "team@example.com", "Team"), "POST", f"{API}/groups"),
+            (lambda s: groups.update_group(s, "team@example.com", name="Team"), "PATCH", f"{API}/groups/team%40example.com"),
+            (lambda s: groups.delete_group(s, "team@example.com"), "DELETE", f"{API}/groups/team%40example.com"),
+            (lambda s: members.list_members(s, "team@example.com"), "GET", f"{API}/groups/team%40example.com/members"),
+            (
+                lambda s: members.get_member(s, "team@example.com", "a/b@example.com"),
+                "GET",
+                f"{API}/groups/team%40example.com/members/a%2Fb%40example.com",
+            ),
+            (
+                lambda s: members.add_member(s, "team@example.com", "user@example.com"),
+                "POST",
+                f"{API}/groups/team%40example.com/members",
+            ),
+            (
+                lambda s: members.update_member(s, "team@example.com", "user@example.com", "OWNER"),
+                "PUT",
+                f"{API}/groups/team%40example.com/members/user%40example.com",
+            ),
+            (
+                lambda s: members.remove_member(s, "team@example.com", "user@example.com"),
+                "DELETE",
+                f"{API}/groups/team%40example.com/members/user%40example.com",
+            ),
+            (
+                lambda s: members.has_member(s, "team@example.com", "user@example.com"),
+                "GET",
+                f"{API}/groups/team%40example.com/hasMember/user%40example.com",
+            ),
+            (lambda s: domains.list_domains(s), "GET", f"{API}/customer/my_customer/domains"),
+            (lambda s: domains.get_domain(s, "example.com"), "GET", f"{API}/customer/my_customer/domains/example.com"),
+        ],
+    )
+    async def test_method_and_path(self, directory_api, service, call, method, path):
+        await call(service)
+
+        request = directory_api.requests[0]
+        assert request.method == method
+        assert request_path(request) == path
+
+    async def test_list_groups_params(self, directory_api, service):
+        directory_api.reply(httpx.Response(200, json={"groups": [{"id": "1"}], "nextPageToken": "next"}))
+
+        result = await groups.list_groups(service, max_results=10, domain="example.com", page_token="token")
+
+        assert result == {"groups": [{"id": "1"}], "nextPageToken": "next"}
+        params = directory_api.requests[0].url.params
+        assert params["customer"] == "my_customer"
+        assert params["maxResults"] == "10"
+        assert params["domain"] == "example.com"
+        assert params["pageToken"] == "token"
+
+    async def test_stream_groups_follows_page_tokens(self, directory_api, service):
+        directory_api.reply(
+            httpx.Response(200, json={"groups": [{"id": "1"}], "nextPageToken": "page_2"}),
+            httpx.Response(200, json={"groups": [{"id": "2"}]}),
+        )
+
+        pages = [page async for page in groups.stream_groups(service, domain="example.com")]
+
+        assert pages == [[{"id": "1"}], [{"id": "2"}]]
+        first, second = (r.url.params for r in directory_api.requests)
+        assert "pageToken" not in first
+        assert second["pageToken"] == "page_2"
+        assert second["maxResults"] == str(helper.MAX_PAGE_SIZE)
+        assert second["domain"] == "example.com"
+        assert second["fields"] == groups.GROUP_LIST_FIELDS
+
+    async def test_stream_members_follows_page_tokens(self, directory_api, service):
+        directory_api.reply(
+            httpx.Response(200, json={"members": [{"id": "1"}], "nextPageToken": "page_2"}),
+            httpx.Response(200, json={}),
+        )
+
+        pages = [page async for page in members.stream_members(service, "team@example.com")]
+
+        assert pages == [[{"id": "1"}], []]
+        assert directory_api.requests[1].url.params["pageToken"] == "page_2"
+        assert directory_api.requests[1].url.params["fields"] == members.MEMBER_LIST_FIELDS
+
+    async def test_stream_errors_become_tool_errors(self, directory_api, service):
+        directory_api.reply(httpx.Response(403, json={"error": {"code": 403, "message": "Not Authorized"}}))
+
+        with pytest.raises(ToolError, match="Failed to list members for group team@example.com"):
+            async for _ in members.stream_members(service, "team@example.com"):
+                pass
+
+    async def test_update_group_sends_only_provided_fields(self, directory_api, service):
+        await groups.update_group(service, "team@example.com", description="")
+
+        assert orjson.loads(directory_api.requests[0].content) == {"description": ""}
+
+    async def test_bulk_add_members_reports_per_member_results(self, directory_api, service):
+        directory_api.reply(batch_response([
+            (0, "200 OK", {"email": "a@example.com", "role": "OWNER"}),
+            (1, "409 Conflict", {"error": {"code": 409, "message": "Member already exists."}}),
+        ]))
+
+        result = await members.bulk_add_members(service, "team@example.com", [
+            {"email": "a@example.com", "role": "OWNER"},
+            {"email": "b@example.com"},
+        ])
+
+        assert result["successes"] == [{"email": "a@example.com", "role": "OWNER"}]
+        assert len(result["failures"]) == 1
+        assert result["failures"][0]["email"] == "b@example.com"
+        assert "Member already exists." in result["failures"][0]["error"]
+        assert [body for _, _, body in batch_request_parts(directory_api.requests[0])] == [
+            {"email": "a@example.com", "role": "OWNER"},
+            {"email": "b@example.com", "role": "MEMBER"},
+        ]
+
+    async def test_bulk_remove_members_uses_email_for_empty_responses(self, directory_api, service):
+        directory_api.reply(batch_response([(0, "204 No Content", None)]))
+
+        result = await members.bulk_remove_members(service, "team@example.com", ["a@example.com"])
+
+        assert result == {"successes": [{"email": "a@example.com"}], "failures": []}
+        assert batch_request_parts(directory_api.requests[0])[0][1] == (
+            f"DELETE {API}/groups/team%40example.com/members/a%40example.com HTTP/1.1"
+        )
+
+    async def test_bulk_members_split_into_batch_limit_chunks(self, directory_api, service, monkeypatch):
+        monkeypatch.setattr(members, "BATCH_LIMIT", 2)
+        directory_api.reply(
+            batch_response([(0, "204 No Content", None), (1, "204 No Content", None)]),
+            batch_response([(0, "204 No Content", None)]),
+        )
+
+        result = await members.bulk_remove_members(
+            service, "team@example.com", ["a@example.com", "b@example.com", "c@example.com"]
+        )
+
+        assert len(directory_api.requests) == 2
+        assert [m["email"] for m in result["successes"]] == ["a@example.com", "b@example.com", "c@example.com"]
+
+    @pytest.mark.parametrize(
+        "failure",
+        [
+            httpx.ReadTimeout("timed out"),
+            httpx.Response(200, content=b"not a batch response", headers={"Content-Type": "text/plain"}),
+        ],
+    )
+    async def test_bulk_members_keep_earlier_chunks_when_later_chunk_breaks(
+        self, directory_api, service, monkeypatch, failure
+    ):
+        monkeypatch.setattr(members, "BATCH_LIMIT", 1)
+        directory_api.reply(batch_response([(0, "204 No Content", None)]), failure)
+
+        result = await members.bulk_remove_members(service, "team@example.com", ["a@example.com", "b@example.com"])
+
+        assert result["successes"] == [{"email": "a@example.com"}]
+        assert [f["email"] for f in result["failures"]] == ["b@example.com"]
+        assert result["failures"][0]["error"]
+
+    async def test_bulk_members_first_chunk_timeout_raises(self, directory_api, service):
+        directory_api.reply(httpx.ReadTimeout("timed out"))
+
+        with pytest.raises(ToolError, match="ReadTimeout|timed out"):
+            await members.bulk_remove_members(service, "team@example.com", ["a@example.com"])
+
+    async def test_api_errors_become_tool_errors(self, directory_api, service):
+        directory_api.reply(
+            httpx.Response(404, json={"error": {"code": 404, "message": "Resource Not Found: groupKey"}})
+        )
+
+        with pytest.raises(ToolError, match="Failed to get group missing@example.com. HttpError: .*Resource Not Found"):
+            await groups.get_group(service, "missing@example.com")